@@ -7,11 +7,15 @@ Connects to tableau.nordstrom.com via REST API with Okta SSO/PAT authentication
 import os
 import sys
 import json
+import time
+import random
 import asyncio
 import logging
 import aiohttp
-import xml.etree.ElementTree as ET
-from urllib.parse import urljoin
+from io import BytesIO
+from typing import NamedTuple
+from lxml import etree as ET
+from xml.sax.saxutils import quoteattr
 from dotenv import load_dotenv
 from mcp.server import Server
 from mcp.types import (
@@ -28,6 +32,128 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds to reuse workbook/data source listings before refetching
+LIST_CACHE_TTL = 60
+
+# Cap on in-flight Tableau requests, matching the connector's per-host limit
+MAX_CONCURRENT_REQUESTS = 20
+
+# Attempts for requests throttled (429) or refused (503) by Tableau/Zscaler
+MAX_REQUEST_ATTEMPTS = 3
+RETRY_STATUSES = (429, 503)
+
+# Seconds before a request (or just its connection setup) is abandoned
+REQUEST_TIMEOUT = 30
+CONNECT_TIMEOUT = 10
+
+# Seconds between background re-authentications (tokens expire after 240 minutes)
+TOKEN_REFRESH_INTERVAL = 200 * 60
+
+# Rows per page for list endpoints (the REST API maximum)
+PAGE_SIZE = 1000
+
+# Signin request body; attribute values are filled in already quoted and escaped
+_SIGNIN_TMPL = (
+    b'<tsRequest>'
+    b'<credentials personalAccessTokenName=%b personalAccessTokenSecret=%b>'
+    b'<site contentUrl=%b/>'
+    b'</credentials>'
+    b'</tsRequest>'
+)
+
+# Namespace of Tableau REST API responses
+TABLEAU_NS = 'http://tableau.com/api'
+NS = {'t': TABLEAU_NS}
+
+# The signin response is <tsResponse><credentials><site/><user/></credentials></tsResponse>
+_CRED_XPATH = ET.XPath('/t:tsResponse/t:credentials', namespaces=NS)
+_SITE_TAG = f'{{{TABLEAU_NS}}}site'
+
+_PAGINATION_TAG = f'{{{TABLEAU_NS}}}pagination'
+_WORKBOOK_TAG = f'{{{TABLEAU_NS}}}workbook'
+_DATASOURCE_TAG = f'{{{TABLEAU_NS}}}datasource'
+
+# Per-row lookups of direct children, returning '' when the child is absent
+_PROJECT_NAME_XPATH = ET.XPath('string(./t:project/@name)', namespaces=NS, smart_strings=False)
+_OWNER_NAME_XPATH = ET.XPath('string(./t:owner/@name)', namespaces=NS, smart_strings=False)
+
+# Views of a workbook: <tsResponse><views><view/>...</views></tsResponse>
+_VIEWS_XPATH = ET.XPath('/t:tsResponse/t:views/t:view', namespaces=NS)
+
+def _iter_elements(data, tag):
+    """Stream-parse XML bytes, yielding each element with the given tag"""
+    for _, elem in ET.iterparse(BytesIO(data), events=('end',), tag=tag):
+        yield elem
+        # Free the element and its processed siblings so memory stays flat
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+class Workbook(NamedTuple):
+    """A row of the workbook listing"""
+    id: str
+    name: str
+    description: str
+    size: str
+    createdAt: str
+    updatedAt: str
+    project: str
+    owner: str
+    # Lowercased name/description, precomputed for case-insensitive matching
+    name_lc: str
+    desc_lc: str
+
+class DataSource(NamedTuple):
+    """A row of the data source listing"""
+    id: str
+    name: str
+    description: str
+    type: str
+    createdAt: str
+    updatedAt: str
+    project: str
+    name_lc: str
+    desc_lc: str
+
+def _workbook_row(workbook):
+    """Build a workbook listing row from a <workbook> element"""
+    name = workbook.get('name')
+    description = workbook.get('description', '')
+    return Workbook(
+        id=workbook.get('id'),
+        name=name,
+        description=description,
+        size=workbook.get('size', '0'),
+        createdAt=workbook.get('createdAt'),
+        updatedAt=workbook.get('updatedAt'),
+        project=_PROJECT_NAME_XPATH(workbook) or 'Unknown',
+        owner=_OWNER_NAME_XPATH(workbook) or 'Unknown',
+        name_lc=(name or '').lower(),
+        desc_lc=description.lower()
+    )
+
+def _data_source_row(ds):
+    """Build a data source listing row from a <datasource> element"""
+    name = ds.get('name')
+    description = ds.get('description', '')
+    return DataSource(
+        id=ds.get('id'),
+        name=name,
+        description=description,
+        type=ds.get('type'),
+        createdAt=ds.get('createdAt'),
+        updatedAt=ds.get('updatedAt'),
+        project=_PROJECT_NAME_XPATH(ds) or 'Unknown',
+        name_lc=(name or '').lower(),
+        desc_lc=description.lower()
+    )
+
+def _search_rows(rows, query):
+    """Filter listing rows whose name or description contains the lowercase query"""
+    # Searched locally against the cached listing: Tableau's filters can't
+    # match descriptions, so a server-side filter would drop results
+    return [row for row in rows if query in row.name_lc or query in row.desc_lc]
+
 class TableauServerMCP:
     def __init__(self):
         self.server_url = os.getenv('TABLEAU_SERVER_URL', 'https://tableau.nordstrom.com')
@@ -39,26 +165,50 @@ class TableauServerMCP:
         self.proxy_url = os.getenv('HTTPS_PROXY', 'http://gateway.zscaler.net:80')
         self.no_proxy = os.getenv('NO_PROXY', 'localhost,127.0.0.1')
         
+        # Decide once whether requests to the server go through the proxy
+        bypass_proxy = any(host and host in self.server_url for host in map(str.strip, self.no_proxy.split(',')))
+        self._effective_proxy = self.proxy_url if self.proxy_url and not bypass_proxy else None
+        
         self.auth_token = None
         self.site_uuid = None
+        # Site API base URL and request headers, rebuilt on each signin
+        self._api_base = None
+        self._headers = {}
+        self._xml_headers = {}
         self.session = None
         
+        # In-memory TTL cache for list responses: key -> (timestamp, data)
+        self._cache = {}
+        self._cache_locks = {}
+        # Lowercased workbook name -> id, rebuilt whenever the workbook listing is fetched
+        self._name_index = {}
+        
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._refresh_task = None
+        
+        # Concurrent requests without a token wait on one in-flight signin
+        self._auth_cond = asyncio.Condition()
+        self._authing = False
+        
     async def initialize_session(self):
         """Initialize HTTP session with proxy configuration"""
-        connector = aiohttp.TCPConnector()
+        # One pooled connector for the life of the process so keep-alive
+        # connections (and their TLS handshakes) are reused across tool calls
+        connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=MAX_CONCURRENT_REQUESTS,
+            keepalive_timeout=75,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
         
-        # Configure proxy if needed
-        if self.proxy_url and not any(host in self.server_url for host in self.no_proxy.split(',')):
-            self.session = aiohttp.ClientSession(
-                connector=connector,
-                trust_env=True,
-                headers={'User-Agent': 'Nordstrom-Tableau-MCP/1.0'}
-            )
-        else:
-            self.session = aiohttp.ClientSession(
-                connector=connector,
-                headers={'User-Agent': 'Nordstrom-Tableau-MCP/1.0'}
-            )
+        # Bounded timeouts so a dead proxy tunnel fails a tool call instead of hanging it
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            trust_env=bool(self._effective_proxy),
+            headers={'User-Agent': 'Nordstrom-Tableau-MCP/1.0'},
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, connect=CONNECT_TIMEOUT)
+        )
     
     async def authenticate(self):
         """Authenticate with Tableau Server using Personal Access Token"""
@@ -68,29 +218,34 @@ class TableauServerMCP:
         auth_url = f"{self.server_url}/api/3.19/auth/signin"
         
         # Create signin request XML
-        signin_xml = f"""
-        <tsRequest>
-            <credentials personalAccessTokenName='{self.token_name}' personalAccessTokenSecret='{self.token_value}'>
-                <site contentUrl='{self.site_id}' />
-            </credentials>
-        </tsRequest>
-        """
+        signin_xml = _SIGNIN_TMPL % (
+            quoteattr(self.token_name).encode(),
+            quoteattr(self.token_value).encode(),
+            quoteattr(self.site_id).encode()
+        )
         
         headers = {'Content-Type': 'application/xml'}
         
         try:
-            async with self.session.post(auth_url, data=signin_xml, headers=headers, proxy=self.proxy_url if self.proxy_url else None) as response:
+            async with self.session.post(auth_url, data=signin_xml, headers=headers, proxy=self._effective_proxy) as response:
                 if response.status == 200:
-                    xml_response = await response.text()
+                    xml_response = await response.read()
                     root = ET.fromstring(xml_response)
                     
                     # Extract auth token and site ID
-                    credentials = root.find('.//credentials')
-                    if credentials is not None:
-                        self.auth_token = credentials.get('token')
-                        site = credentials.find('site')
+                    credentials = _CRED_XPATH(root)
+                    if credentials:
+                        self.auth_token = credentials[0].get('token')
+                        site = credentials[0].find(_SITE_TAG)
                         if site is not None:
                             self.site_uuid = site.get('id')
+                        
+                        # Precompute the site API base URL and per-request headers
+                        if self.auth_token and self.site_uuid:
+                            self._api_base = f"{self.server_url.rstrip('/')}/api/3.19/sites/{self.site_uuid}/"
+                            self._headers = {'X-Tableau-Auth': self.auth_token}
+                            # Only requests with a body need a Content-Type
+                            self._xml_headers = {**self._headers, 'Content-Type': 'application/xml'}
                     
                     logger.info(f"Successfully authenticated to {self.server_url}")
                     return True
@@ -103,97 +258,207 @@ class TableauServerMCP:
             logger.error(f"Authentication error: {str(e)}")
             return False
     
+    async def _ensure_authenticated(self):
+        """Sign in if there is no token, sharing a single signin between concurrent callers"""
+        async with self._auth_cond:
+            if self.auth_token:
+                return
+            if self._authing:
+                await self._auth_cond.wait_for(lambda: not self._authing)
+                return
+            self._authing = True
+        
+        try:
+            await self.authenticate()
+        finally:
+            async with self._auth_cond:
+                self._authing = False
+                self._auth_cond.notify_all()
+    
     async def make_api_request(self, endpoint, method='GET', data=None):
         """Make authenticated API request to Tableau Server"""
-        if not self.auth_token:
-            await self.authenticate()
+        await self._ensure_authenticated()
+        if not self.auth_token or not self._api_base:
+            return None
         
-        url = urljoin(self.server_url, f"/api/3.19/sites/{self.site_uuid}/{endpoint}")
-        headers = {
-            'X-Tableau-Auth': self.auth_token,
-            'Content-Type': 'application/xml' if data else 'application/json'
-        }
+        url = self._api_base + endpoint
+        headers = self._xml_headers if data else self._headers
         
-        try:
-            async with self.session.request(method, url, data=data, headers=headers, proxy=self.proxy_url if self.proxy_url else None) as response:
-                if response.status in [200, 201]:
-                    if 'xml' in response.content_type:
-                        return await response.text()
-                    else:
-                        return await response.json()
-                else:
-                    error_text = await response.text()
-                    logger.error(f"API request failed: {response.status} - {error_text}")
+        attempt = 0
+        reauthenticated = False
+        while True:
+            try:
+                async with self._sem:
+                    async with self.session.request(method, url, data=data, headers=headers, proxy=self._effective_proxy) as response:
+                        if response.status in [200, 201]:
+                            if 'xml' in response.content_type:
+                                return await response.read()
+                            else:
+                                return await response.json()
+                        
+                        status = response.status
+                        error_text = await response.text()
+            except Exception as e:
+                logger.error(f"API request error: {str(e)}")
+                return None
+            
+            # An expired or revoked token gets one fresh signin and an immediate retry
+            if status == 401 and not reauthenticated:
+                logger.warning("API request unauthorized, re-authenticating")
+                reauthenticated = True
+                # Only drop the token if no other request has already replaced it
+                if self.auth_token == headers['X-Tableau-Auth']:
+                    self.auth_token = None
+                await self._ensure_authenticated()
+                if not self.auth_token or not self._api_base:
                     return None
-        except Exception as e:
-            logger.error(f"API request error: {str(e)}")
-            return None
+                url = self._api_base + endpoint
+                headers = self._xml_headers if data else self._headers
+                continue
+            
+            attempt += 1
+            if status not in RETRY_STATUSES or attempt == MAX_REQUEST_ATTEMPTS:
+                logger.error(f"API request failed: {status} - {error_text}")
+                return None
+            
+            logger.warning(f"API request throttled: {status}, retrying")
+            # Back off outside the semaphore so other requests can proceed
+            await asyncio.sleep(2 ** (attempt - 1) + random.random())
     
-    async def list_workbooks(self):
-        """List all workbooks on the site"""
-        xml_response = await self.make_api_request('workbooks')
+    async def _refresh_loop(self):
+        """Re-authenticate periodically so the token never expires during a tool call"""
+        while True:
+            await asyncio.sleep(TOKEN_REFRESH_INTERVAL)
+            try:
+                await self.authenticate()
+            except ValueError as e:
+                logger.error(f"Token refresh stopped: {e}")
+                return
+    
+    def start_token_refresh(self):
+        """Start refreshing the auth token in the background"""
+        if not self._refresh_task:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+    
+    def _cache_get(self, key, ttl):
+        """Return cached data for key if younger than ttl seconds, else None"""
+        entry = self._cache.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1]
+        return None
+    
+    async def _cached(self, key, ttl, loader):
+        """Return cached data for key if younger than ttl seconds, else await loader()"""
+        data = self._cache_get(key, ttl)
+        if data is not None:
+            return data
+        
+        # Concurrent misses on the same key share a single upstream request
+        lock = self._cache_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            data = self._cache_get(key, ttl)
+            if data is not None:
+                return data
+            data = await loader()
+            # Failed requests are not cached so the next call retries
+            if data is not None:
+                self._cache[key] = (time.monotonic(), data)
+            return data
+    
+    async def _fetch_page(self, endpoint, tag, parse_row, page_number):
+        """Fetch one page of a list endpoint as (rows, totalAvailable), or None if it failed or was unparseable"""
+        xml_response = await self.make_api_request(
+            f'{endpoint}?pageSize={PAGE_SIZE}&pageNumber={page_number}'
+        )
         if not xml_response:
-            return []
+            return None
         
-        workbooks = []
+        rows = []
+        total = 0
         try:
-            root = ET.fromstring(xml_response)
-            for workbook in root.findall('.//workbook'):
-                workbooks.append({
-                    'id': workbook.get('id'),
-                    'name': workbook.get('name'),
-                    'description': workbook.get('description', ''),
-                    'size': workbook.get('size', '0'),
-                    'createdAt': workbook.get('createdAt'),
-                    'updatedAt': workbook.get('updatedAt'),
-                    'project': workbook.find('.//project').get('name') if workbook.find('.//project') is not None else 'Unknown',
-                    'owner': workbook.find('.//owner').get('name') if workbook.find('.//owner') is not None else 'Unknown'
-                })
+            for elem in _iter_elements(xml_response, (_PAGINATION_TAG, tag)):
+                if elem.tag == _PAGINATION_TAG:
+                    total = int(elem.get('totalAvailable', '0'))
+                else:
+                    rows.append(parse_row(elem))
         except ET.ParseError as e:
-            logger.error(f"Error parsing workbooks XML: {e}")
+            # A truncated page is treated as a failed request so it is never cached
+            logger.error(f"Error parsing {endpoint} XML: {e}")
+            return None
         
+        return rows, total
+    
+    async def _fetch_all(self, endpoint, tag, parse_row):
+        """Fetch every page of a list endpoint, or None if any page failed"""
+        first = await self._fetch_page(endpoint, tag, parse_row, 1)
+        if first is None:
+            return None
+        
+        rows, total = first
+        page_count = -(-total // PAGE_SIZE)
+        if page_count > 1:
+            # Remaining pages are independent; the request semaphore bounds the fan-out
+            pages = await asyncio.gather(*(
+                self._fetch_page(endpoint, tag, parse_row, page_number)
+                for page_number in range(2, page_count + 1)
+            ))
+            for page in pages:
+                if page is None:
+                    return None
+                rows.extend(page[0])
+        
+        return rows
+    
+    async def list_workbooks(self):
+        """List all workbooks on the site"""
+        return await self._cached('workbooks', LIST_CACHE_TTL, self._fetch_workbooks) or []
+    
+    async def _fetch_workbooks(self):
+        """Fetch and parse the workbook list, or None if the request failed"""
+        workbooks = await self._fetch_all('workbooks', _WORKBOOK_TAG, _workbook_row)
+        if workbooks is not None:
+            # Reversed so the first workbook wins when names collide
+            self._name_index = {wb.name_lc: wb.id for wb in reversed(workbooks)}
         return workbooks
     
+    async def find_workbook_id(self, workbook_name):
+        """Return the id of the workbook with this name (case-insensitive), or None"""
+        await self.list_workbooks()
+        return self._name_index.get(workbook_name.lower())
+    
     async def list_data_sources(self):
         """List all data sources on the site"""
-        xml_response = await self.make_api_request('datasources')
-        if not xml_response:
-            return []
-        
-        data_sources = []
-        try:
-            root = ET.fromstring(xml_response)
-            for ds in root.findall('.//datasource'):
-                data_sources.append({
-                    'id': ds.get('id'),
-                    'name': ds.get('name'),
-                    'description': ds.get('description', ''),
-                    'type': ds.get('type'),
-                    'createdAt': ds.get('createdAt'),
-                    'updatedAt': ds.get('updatedAt'),
-                    'project': ds.find('.//project').get('name') if ds.find('.//project') is not None else 'Unknown'
-                })
-        except ET.ParseError as e:
-            logger.error(f"Error parsing data sources XML: {e}")
-        
-        return data_sources
+        return await self._cached('datasources', LIST_CACHE_TTL, self._fetch_data_sources) or []
+    
+    async def _fetch_data_sources(self):
+        """Fetch and parse the data source list, or None if the request failed"""
+        return await self._fetch_all('datasources', _DATASOURCE_TAG, _data_source_row)
+    
+    async def search_workbooks(self, query):
+        """Find workbooks whose name or description contains the lowercase query"""
+        return _search_rows(await self.list_workbooks(), query)
+    
+    async def search_data_sources(self, query):
+        """Find data sources whose name or description contains the lowercase query"""
+        return _search_rows(await self.list_data_sources(), query)
     
     async def get_workbook_details(self, workbook_id):
         """Get detailed information about a specific workbook"""
-        xml_response = await self.make_api_request(f'workbooks/{workbook_id}')
+        # The workbook and its views (worksheets/dashboards) are independent requests
+        xml_response, views_response = await asyncio.gather(
+            self.make_api_request(f'workbooks/{workbook_id}'),
+            self.make_api_request(f'workbooks/{workbook_id}/views')
+        )
         if not xml_response:
             return None
         
         try:
             root = ET.fromstring(xml_response)
-            workbook = root.find('.//workbook')
+            workbook = root.find(_WORKBOOK_TAG)
             if workbook is not None:
-                # Get views (worksheets/dashboards) for this workbook
-                views_response = await self.make_api_request(f'workbooks/{workbook_id}/views')
                 views = []
                 if views_response:
-                    views_root = ET.fromstring(views_response)
-                    for view in views_root.findall('.//view'):
+                    for view in _VIEWS_XPATH(ET.fromstring(views_response)):
                         views.append({
                             'id': view.get('id'),
                             'name': view.get('name'),
@@ -216,6 +481,9 @@ class TableauServerMCP:
     
     async def close(self):
         """Clean up resources"""
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            self._refresh_task = None
         if self.session:
             await self.session.close()
 
@@ -294,9 +562,6 @@ async def handle_list_tools() -> ListToolsResult:
 async def handle_call_tool(name: str, arguments: dict) -> CallToolResult:
     """Handle tool calls"""
     try:
-        if not tableau_client.session:
-            await tableau_client.initialize_session()
-        
         if name == "test_connection":
             success = await tableau_client.authenticate()
             if success:
@@ -320,18 +585,20 @@ async def handle_call_tool(name: str, arguments: dict) -> CallToolResult:
         elif name == "list_workbooks":
             workbooks = await tableau_client.list_workbooks()
             if workbooks:
-                workbook_list = "\n".join([
-                    f"📊 **{wb['name']}**\n"
-                    f"   Project: {wb['project']}\n"
-                    f"   Owner: {wb['owner']}\n"
-                    f"   Updated: {wb['updatedAt']}\n"
-                    f"   Size: {wb['size']} bytes\n"
+                # Header and rows are joined once into the final text
+                lines = [f"Found {len(workbooks)} workbooks on tableau.nordstrom.com:\n"]
+                lines.extend(
+                    f"📊 **{wb.name}**\n"
+                    f"   Project: {wb.project}\n"
+                    f"   Owner: {wb.owner}\n"
+                    f"   Updated: {wb.updatedAt}\n"
+                    f"   Size: {wb.size} bytes\n"
                     for wb in workbooks
-                ])
+                )
                 return CallToolResult(
                     content=[TextContent(
                         type="text",
-                        text=f"Found {len(workbooks)} workbooks on tableau.nordstrom.com:\n\n{workbook_list}"
+                        text="\n".join(lines)
                     )]
                 )
             else:
@@ -345,17 +612,18 @@ async def handle_call_tool(name: str, arguments: dict) -> CallToolResult:
         elif name == "list_data_sources":
             data_sources = await tableau_client.list_data_sources()
             if data_sources:
-                ds_list = "\n".join([
-                    f"🗄️ **{ds['name']}**\n"
-                    f"   Type: {ds['type']}\n"
-                    f"   Project: {ds['project']}\n"
-                    f"   Updated: {ds['updatedAt']}\n"
+                lines = [f"Found {len(data_sources)} data sources:\n"]
+                lines.extend(
+                    f"🗄️ **{ds.name}**\n"
+                    f"   Type: {ds.type}\n"
+                    f"   Project: {ds.project}\n"
+                    f"   Updated: {ds.updatedAt}\n"
                     for ds in data_sources
-                ])
+                )
                 return CallToolResult(
                     content=[TextContent(
                         type="text",
-                        text=f"Found {len(data_sources)} data sources:\n\n{ds_list}"
+                        text="\n".join(lines)
                     )]
                 )
             else:
@@ -372,11 +640,8 @@ async def handle_call_tool(name: str, arguments: dict) -> CallToolResult:
             
             if workbook_name and not workbook_id:
                 # Find workbook by name
-                workbooks = await tableau_client.list_workbooks()
-                matching_workbook = next((wb for wb in workbooks if wb['name'].lower() == workbook_name.lower()), None)
-                if matching_workbook:
-                    workbook_id = matching_workbook['id']
-                else:
+                workbook_id = await tableau_client.find_workbook_id(workbook_name)
+                if not workbook_id:
                     return CallToolResult(
                         content=[TextContent(
                             type="text",
@@ -419,23 +684,22 @@ async def handle_call_tool(name: str, arguments: dict) -> CallToolResult:
         
         elif name == "search_content":
             query = arguments.get("query", "").lower()
-            workbooks = await tableau_client.list_workbooks()
-            data_sources = await tableau_client.list_data_sources()
-            
-            matching_workbooks = [wb for wb in workbooks if query in wb['name'].lower() or query in wb['description'].lower()]
-            matching_data_sources = [ds for ds in data_sources if query in ds['name'].lower() or query in ds['description'].lower()]
+            matching_workbooks, matching_data_sources = await asyncio.gather(
+                tableau_client.search_workbooks(query),
+                tableau_client.search_data_sources(query)
+            )
             
             results = []
             
             if matching_workbooks:
                 results.append(f"**📊 Workbooks matching '{query}':**")
                 for wb in matching_workbooks:
-                    results.append(f"   • {wb['name']} (Project: {wb['project']})")
+                    results.append(f"   • {wb.name} (Project: {wb.project})")
             
             if matching_data_sources:
                 results.append(f"\n**🗄️ Data Sources matching '{query}':**")
                 for ds in matching_data_sources:
-                    results.append(f"   • {ds['name']} (Type: {ds['type']})")
+                    results.append(f"   • {ds.name} (Type: {ds.type})")
             
             if not matching_workbooks and not matching_data_sources:
                 results.append(f"No content found matching '{query}'")
@@ -485,13 +749,30 @@ async def main():
             # Debug mode - run with more logging
             logging.getLogger().setLevel(logging.DEBUG)
     
-    # Run MCP server
-    async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    # Run MCP server with one HTTP session shared by every tool call
+    await tableau_client.initialize_session()
+    try:
+        # Sign in up front so the first tool call doesn't pay for it
+        try:
+            await tableau_client.authenticate()
+        except ValueError as e:
+            logger.error(str(e))
+        tableau_client.start_token_refresh()
+        
+        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        await tableau_client.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # uvloop is optional; fall back to the default event loop where it isn't installed
+    try:
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())